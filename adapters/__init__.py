@@ -4,6 +4,7 @@ Platform Adapters
 
 from .base import PlatformAdapter, Platform, Post, User, EngagementResult
 from .instagram import InstagramAdapter
+from .rate_limiter import RateLimiter, TransientError
 
 __all__ = [
     "PlatformAdapter",
@@ -11,5 +12,7 @@ __all__ = [
     "Post",
     "User",
     "EngagementResult",
-    "InstagramAdapter"
+    "InstagramAdapter",
+    "RateLimiter",
+    "TransientError"
 ]
@@ -3,6 +3,7 @@ Base Platform Adapter
 Abstract interface that all platform adapters must implement
 """
 
+import sys
 from abc import ABC, abstractmethod
 from typing import List, Dict, Optional, Any
 from dataclasses import dataclass
@@ -10,6 +11,10 @@ from datetime import datetime
 from enum import Enum
 
 
+# dataclass(slots=True) needs Python 3.10+, plain dataclasses otherwise
+SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
 class Platform(Enum):
     INSTAGRAM = "instagram"
     TWITTER = "twitter"
@@ -17,7 +22,7 @@ class Platform(Enum):
     LINKEDIN = "linkedin"
 
 
-@dataclass
+@dataclass(**SLOTS)
 class Post:
     """Represents a social media post"""
     platform: Platform
@@ -38,7 +43,7 @@ class Post:
             self.hashtags = []
 
 
-@dataclass
+@dataclass(**SLOTS)
 class User:
     """Represents a social media user"""
     platform: Platform
@@ -53,7 +58,7 @@ class User:
     verified: bool = False
 
 
-@dataclass
+@dataclass(**SLOTS)
 class EngagementResult:
     """Result of an engagement action"""
     success: bool
@@ -123,6 +128,13 @@ class PlatformAdapter(ABC):
         """Like a post"""
         pass
     
+    async def like_many(self, post_ids: List[str], concurrency: int = 3) -> List[EngagementResult]:
+        """
+        Like several posts
+        Adapters may override this to run the likes concurrently
+        """
+        return [await self.like(post_id) for post_id in post_ids]
+    
     @abstractmethod
     async def follow(self, user_id: str) -> EngagementResult:
         """Follow a user"""
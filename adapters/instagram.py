@@ -4,11 +4,194 @@ Implementation for Instagram
 """
 
 import asyncio
+import functools
+import logging
 import random
-from typing import List, Dict, Optional, Any
+import time
+from collections import OrderedDict
+from typing import List, Dict, Optional, Any, Tuple, Callable
 from datetime import datetime
 
 from .base import PlatformAdapter, Platform, Post, User, EngagementResult
+from .rate_limiter import RateLimiter, TransientError
+
+logger = logging.getLogger(__name__)
+
+
+# Fail fast instead of waiting out Playwright's 30s default
+SELECTOR_TIMEOUT_MS = 5000
+LOGIN_TIMEOUT_MS = 15000
+
+# Public web app ID expected by Instagram's JSON endpoints
+IG_APP_ID = "936619743392459"
+PROFILE_API_URL = "https://i.instagram.com/api/v1/users/web_profile_info/"
+
+# Default calls per hour for each throttled action
+DEFAULT_RATE_LIMITS = {
+    "search": 200,
+    "lookup": 200,
+    "comment": 60,
+    "like": 350,
+}
+
+# Soft blocks are recognized from the redirect target or HTTP status rather
+# than page text, which follows the account's UI language
+SOFT_BLOCK_PATHS = ("/challenge/", "/accounts/suspended/")
+SOFT_BLOCK_STATUSES = (429,)
+
+# aria-labels follow the account's UI language, so try each locale we know
+COMMENT_SELECTORS = [
+    'textarea[aria-label*="comment" i]',
+    'textarea[aria-label*="评论"]',
+    'textarea[aria-label*="Kommentar"]',
+    'textarea[aria-label*="comentario" i]',
+    'textarea[aria-label*="commentaire" i]',
+]
+LIKE_SELECTORS = [
+    'svg[aria-label="Like"]',
+    'svg[aria-label="赞"]',
+    'svg[aria-label="Gefällt mir"]',
+    'svg[aria-label="Me gusta"]',
+    'svg[aria-label="J’aime"]',
+]
+
+# Any-locale selectors, and the candidates to probe for each element kind
+COMMENT_BOX = ", ".join(COMMENT_SELECTORS)
+LIKE_BTN = ", ".join(LIKE_SELECTORS)
+LOCALIZED_SELECTORS = {
+    "comment": (COMMENT_BOX, COMMENT_SELECTORS),
+    "like": (LIKE_BTN, LIKE_SELECTORS),
+}
+
+# Scrolls the results page a few times, then returns every post link href
+SCROLL_AND_COLLECT_JS = """
+async () => {
+    for (let i = 0; i < 3; i++) {
+        window.scrollBy(0, 1000);
+        await new Promise(r => setTimeout(r, 800));
+    }
+    return Array.from(document.querySelectorAll('article a'))
+        .map(a => a.getAttribute('href'))
+        .filter(h => h && h.includes('/p/'));
+}
+"""
+
+
+def _throttled(action: str, fallback: Callable[..., Any]):
+    """
+    Run an adapter method under the rate limit for `action`
+    Soft blocks (TransientError) are retried with exponential backoff. If
+    they persist the adapter cools down, and until then the method returns
+    fallback(*args) without touching the page. Instagram blocks the whole
+    session, so the cooldown is shared by every action.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            if time.monotonic() < self._blocked_until:
+                return fallback(*args, **kwargs)
+            
+            backoff = self._backoff_seconds
+            for attempt in range(self._max_retries + 1):
+                await self._rate_limiter.acquire(action)
+                try:
+                    return await method(self, *args, **kwargs)
+                except TransientError as e:
+                    logger.warning("Instagram throttled %s: %s", action, e)
+                    if attempt < self._max_retries:
+                        await asyncio.sleep(backoff)
+                        backoff *= 2
+            
+            self._blocked_until = time.monotonic() + self._cooldown_seconds
+            return fallback(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _rate_limited_result(action: str):
+    """Fallback producing a failed EngagementResult for a throttled action"""
+    def fallback(page, post_id: str, *args, **kwargs) -> EngagementResult:
+        return EngagementResult(
+            success=False,
+            platform=Platform.INSTAGRAM,
+            action=action,
+            post_id=post_id,
+            error="rate_limited"
+        )
+    return fallback
+
+
+class _SharedBrowser:
+    """
+    Process-wide Playwright driver and Chromium instances.
+    Adapters share one browser per endpoint and each open their own context.
+    Launch options come from the first adapter to acquire the browser.
+    """
+    
+    _playwright = None
+    _browsers: Dict[Optional[str], Any] = {}
+    _refs: Dict[Optional[str], int] = {}
+    _lock: Optional[asyncio.Lock] = None
+    
+    @classmethod
+    async def acquire(cls, config: Dict[str, Any]):
+        """Return the shared browser, launching or connecting on first use"""
+        if cls._lock is None:
+            cls._lock = asyncio.Lock()
+        
+        # An empty endpoint means a locally launched browser
+        endpoint = config.get("cdp_endpoint") or None
+        
+        async with cls._lock:
+            if cls._playwright is None:
+                from playwright.async_api import async_playwright
+                cls._playwright = await async_playwright().start()
+            
+            browser = cls._browsers.get(endpoint)
+            if browser is None or not browser.is_connected():
+                try:
+                    if endpoint:
+                        browser = await cls._playwright.chromium.connect_over_cdp(endpoint)
+                    else:
+                        args = []
+                        port = config.get("remote_debugging_port")
+                        if port:
+                            # Lets other processes attach via cdp_endpoint
+                            args.append(f"--remote-debugging-port={port}")
+                        # Headless Chromium needs far less memory and CPU
+                        browser = await cls._playwright.chromium.launch(
+                            headless=config.get("headless", True),
+                            args=args
+                        )
+                except Exception:
+                    # Don't leave a driver running that no browser uses
+                    if not cls._browsers:
+                        await cls._playwright.stop()
+                        cls._playwright = None
+                    raise
+                cls._browsers[endpoint] = browser
+            
+            cls._refs[endpoint] = cls._refs.get(endpoint, 0) + 1
+            return browser
+    
+    @classmethod
+    async def release(cls, config: Dict[str, Any]):
+        """Drop a reference, closing the browser and driver when unused"""
+        endpoint = config.get("cdp_endpoint") or None
+        
+        async with cls._lock:
+            cls._refs[endpoint] = cls._refs.get(endpoint, 1) - 1
+            if cls._refs[endpoint] > 0:
+                return
+            
+            del cls._refs[endpoint]
+            browser = cls._browsers.pop(endpoint, None)
+            if browser:
+                await browser.close()
+            
+            if not cls._browsers and cls._playwright:
+                await cls._playwright.stop()
+                cls._playwright = None
 
 
 class InstagramAdapter(PlatformAdapter):
@@ -20,6 +203,36 @@ class InstagramAdapter(PlatformAdapter):
         self.context = None
         self.page = None
         self.logged_in = False
+        
+        # Recycle the context periodically so Playwright's per-connection
+        # object cache doesn't grow for the lifetime of the adapter
+        self._max_ops_per_context = config.get("ops_per_context", 50)
+        self._ops_since_recycle = 0
+        self._open_pool_pages = 0  # like_many pages living in the current context
+        self._saved_state = None
+        
+        # Short-lived caches so repeat lookups skip the page navigation
+        # (LRU, so a long-running adapter doesn't keep everything it saw)
+        self._cache_ttl = config.get("cache_ttl", 300)
+        self._cache_size = config.get("cache_size", 1024)
+        self._post_cache: "OrderedDict[str, Tuple[Post, float]]" = OrderedDict()
+        self._user_cache: "OrderedDict[str, Tuple[User, float]]" = OrderedDict()
+        
+        # Selector that matched for each element kind in this session
+        self._selectors: Dict[str, str] = {}
+        
+        # Pooled HTTP session for metadata lookups that don't need a page
+        self._http = None
+        
+        # Throttling and soft-block handling
+        self._rate_limiter = RateLimiter({
+            **DEFAULT_RATE_LIMITS,
+            **config.get("rate_limits", {})
+        })
+        self._max_retries = config.get("max_retries", 3)
+        self._backoff_seconds = config.get("backoff_seconds", 30)
+        self._cooldown_seconds = config.get("cooldown_seconds", 900)
+        self._blocked_until = 0.0  # one cooldown for all actions
     
     def get_platform(self) -> Platform:
         return Platform.INSTAGRAM
@@ -27,40 +240,44 @@ class InstagramAdapter(PlatformAdapter):
     async def login(self, credentials: Dict[str, str]) -> bool:
         """Login to Instagram using Playwright"""
         try:
-            from playwright.async_api import async_playwright
-            
             username = credentials.get("username")
             password = credentials.get("password")
             
-            async with async_playwright() as p:
-                self.browser = await p.chromium.launch(headless=False)
-                self.context = await self.browser.new_context()
-                self.page = await self.context.new_page()
-                
-                # Go to Instagram login
-                await self.page.goto("https://www.instagram.com/accounts/login/")
-                await self.page.wait_for_load_state("networkidle")
-                
-                # Enter username
-                await self.page.fill('input[name="username"]', username)
-                await self.page.fill('input[name="password"]', password)
-                
-                # Click login
-                await self.page.click('button[type="submit"]')
-                await self.page.wait_for_load_state("networkidle")
-                
-                # Check if logged in
-                if "accounts/login" not in self.page.url:
-                    self.logged_in = True
-                    return True
-                
-                await self.browser.close()
-                return False
+            await self._init_browser()
+            
+            # Go to Instagram login
+            await self._goto("https://www.instagram.com/accounts/login/")
+            await self._wait_for('input[name="username"]')
+            
+            # Enter username
+            await self.page.fill('input[name="username"]', username)
+            await self.page.fill('input[name="password"]', password)
+            
+            # Click login
+            await self.page.click('button[type="submit"]')
+            try:
+                await self.page.wait_for_url(
+                    lambda url: "accounts/login" not in url,
+                    timeout=LOGIN_TIMEOUT_MS
+                )
+            except Exception:
+                pass  # Still on the login page, handled below
+            
+            # Check if logged in
+            if "accounts/login" not in self.page.url:
+                self.logged_in = True
+                # Keep cookies so recycled contexts stay authenticated
+                self._saved_state = await self.context.storage_state()
+                return True
+            
+            await self.close()
+            return False
                 
         except Exception as e:
-            print(f"Login failed: {e}")
+            logger.warning("Login failed: %s", e)
             return False
     
+    @_throttled("search", lambda *args, **kwargs: [])
     async def search_posts(
         self,
         query: str = None,
@@ -81,49 +298,52 @@ class InstagramAdapter(PlatformAdapter):
         try:
             # Go to explore page with search
             search_url = f"https://www.instagram.com/explore/search/keyword/?q={search_term}"
-            await self.page.goto(search_url)
-            await self.page.wait_for_load_state("networkidle")
+            await self._goto(search_url)
             
             # Wait for posts to load
-            await asyncio.sleep(2)
+            await self._wait_for('article a')
             
-            # Scroll to load more posts
-            for _ in range(3):
-                await self.page.evaluate("window.scrollBy(0, 1000)")
-                await asyncio.sleep(1)
+            # Scroll to load more posts and collect post links in one round-trip
+            hrefs = await self.page.evaluate(SCROLL_AND_COLLECT_JS)
             
             # Extract posts (simplified - real implementation needs more robust parsing)
-            post_elements = await self.page.query_selector_all('article a')
-            
-            for elem in post_elements[:limit]:
-                try:
-                    href = await elem.get_attribute("href")
-                    if href and "/p/" in href:
-                        post_id = href.split("/p/")[1].split("/")[0]
-                        posts.append(Post(
-                            platform=Platform.INSTAGRAM,
-                            post_id=post_id,
-                            url=f"https://www.instagram.com/p/{post_id}/",
-                            author="",  # Would need to fetch
-                            author_id="",
-                            content=""  # Would need to fetch
-                        ))
-                except:
-                    continue
+            for href in hrefs[:limit]:
+                post_id = href.split("/p/")[1].split("/")[0]
+                posts.append(Post(
+                    platform=Platform.INSTAGRAM,
+                    post_id=post_id,
+                    url=f"https://www.instagram.com/p/{post_id}/",
+                    author="",  # Would need to fetch
+                    author_id="",
+                    content=""  # Would need to fetch
+                ))
             
+        except TransientError:
+            raise
         except Exception as e:
-            print(f"Search failed: {e}")
+            logger.warning("Search failed: %s", e)
         
         return posts
     
     async def get_post(self, post_id: str) -> Optional[Post]:
         """Get a specific Instagram post"""
+        cached = self._cache_get(self._post_cache, post_id)
+        if cached:
+            return cached
+        
+        post = await self._fetch_post(post_id)
+        if post:
+            self._cache_put(self._post_cache, post_id, post)
+        return post
+    
+    @_throttled("lookup", lambda *args, **kwargs: None)
+    async def _fetch_post(self, post_id: str) -> Optional[Post]:
+        """Load a post page and extract it"""
         if not self.page:
             await self._init_browser()
         
         try:
-            await self.page.goto(f"https://www.instagram.com/p/{post_id}/")
-            await self.page.wait_for_load_state("networkidle")
+            await self._goto(f"https://www.instagram.com/p/{post_id}/")
             
             # Extract post data (simplified)
             # In real implementation, parse the page HTML
@@ -136,18 +356,36 @@ class InstagramAdapter(PlatformAdapter):
                 author_id="extracted_author_id",
                 content="extracted_content"
             )
+        except TransientError:
+            raise
         except Exception as e:
-            print(f"Get post failed: {e}")
+            logger.warning("Get post failed: %s", e)
             return None
     
     async def get_user(self, username: str) -> Optional[User]:
         """Get Instagram user profile"""
+        cached = self._cache_get(self._user_cache, username)
+        if cached:
+            return cached
+        
+        user = await self._fetch_user(username)
+        if user:
+            self._cache_put(self._user_cache, username, user)
+        return user
+    
+    @_throttled("lookup", lambda *args, **kwargs: None)
+    async def _fetch_user(self, username: str) -> Optional[User]:
+        """Load a user profile, preferring the JSON API over the page"""
+        # A single JSON request is much cheaper than rendering the profile
+        user = await self._get_user_via_api(username)
+        if user:
+            return user
+        
         if not self.page:
             await self._init_browser()
         
         try:
-            await self.page.goto(f"https://www.instagram.com/{username}/")
-            await self.page.wait_for_load_state("networkidle")
+            await self._goto(f"https://www.instagram.com/{username}/")
             
             # Extract user data (simplified)
             return User(
@@ -156,10 +394,77 @@ class InstagramAdapter(PlatformAdapter):
                 username=username,
                 display_name=username
             )
+        except TransientError:
+            raise
+        except Exception as e:
+            logger.warning("Get user failed: %s", e)
+            return None
+    
+    async def _get_user_via_api(self, username: str) -> Optional[User]:
+        """Fetch a profile from the web_profile_info endpoint, None on failure"""
+        try:
+            import aiohttp
+        except ImportError:
+            return None
+        
+        if self._http is None:
+            self._http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=64, keepalive_timeout=30),
+                timeout=aiohttp.ClientTimeout(total=10)
+            )
+        
+        headers = {"X-IG-App-ID": IG_APP_ID}
+        cookie_header = await self._cookie_header()
+        if cookie_header:
+            headers["Cookie"] = cookie_header
+        
+        try:
+            async with self._http.get(
+                PROFILE_API_URL,
+                params={"username": username},
+                headers=headers
+            ) as response:
+                if response.status == 429:
+                    raise TransientError("profile API returned 429")
+                if response.status >= 400:
+                    return None
+                data = await response.json()
+            
+            user = data["data"]["user"]
+            return User(
+                platform=Platform.INSTAGRAM,
+                user_id=user["id"],
+                username=user["username"],
+                display_name=user.get("full_name") or user["username"],
+                bio=user.get("biography") or "",
+                followers=user.get("edge_followed_by", {}).get("count", 0),
+                following=user.get("edge_follow", {}).get("count", 0),
+                posts_count=user.get("edge_owner_to_timeline_media", {}).get("count", 0),
+                is_private=user.get("is_private", False),
+                verified=user.get("is_verified", False)
+            )
+        except TransientError:
+            raise
         except Exception as e:
-            print(f"Get user failed: {e}")
+            logger.warning("Profile API lookup failed: %s", e)
             return None
     
+    async def _cookie_header(self) -> str:
+        """Cookie header built from the live context, else the saved login state"""
+        if self.context:
+            # Picks up cookies Instagram rotated since login
+            cookies = await self.context.cookies()
+        elif self._saved_state:
+            cookies = self._saved_state.get("cookies", [])
+        else:
+            return ""
+        
+        return "; ".join(
+            f"{c['name']}={c['value']}"
+            for c in cookies
+            if "instagram.com" in c.get("domain", "")
+        )
+    
     async def comment(self, post_id: str, comment: str) -> EngagementResult:
         """Post a comment on an Instagram post"""
         if not self.logged_in:
@@ -171,21 +476,26 @@ class InstagramAdapter(PlatformAdapter):
                 error="Not logged in"
             )
         
+        return await self._comment_on_page(None, post_id, comment)
+    
+    @_throttled("comment", _rate_limited_result("comment"))
+    async def _comment_on_page(self, page, post_id: str, comment: str) -> EngagementResult:
+        """Post a comment using the given page (None for the main page)"""
         try:
-            await self.page.goto(f"https://www.instagram.com/p/{post_id}/")
-            await self.page.wait_for_load_state("networkidle")
+            page = await self._goto(f"https://www.instagram.com/p/{post_id}/", page)
             
-            # Random delay to appear human
-            await asyncio.sleep(random.uniform(1, 3))
+            # Short jitter only; Engagement.engage already paces comments
+            # 30-120s apart, and the selector wait below adds its own latency
+            await asyncio.sleep(random.uniform(0.3, 0.8))
             
             # Find comment box
-            comment_box = await self.page.query_selector('textarea[aria-label="添加评论..."]')
+            comment_box = await self._find_localized(page, "comment")
             if comment_box:
                 await comment_box.click()
-                await self.page.fill('textarea[aria-label="添加评论..."]', comment)
+                await comment_box.fill(comment)
                 
                 # Submit
-                await self.page.keyboard.press("Enter")
+                await comment_box.press("Enter")
                 await asyncio.sleep(1)
                 
                 return EngagementResult(
@@ -204,6 +514,8 @@ class InstagramAdapter(PlatformAdapter):
                     error="Comment box not found"
                 )
                 
+        except TransientError:
+            raise
         except Exception as e:
             return EngagementResult(
                 success=False,
@@ -224,12 +536,47 @@ class InstagramAdapter(PlatformAdapter):
                 error="Not logged in"
             )
         
+        return await self._like_on_page(None, post_id)
+    
+    async def like_many(self, post_ids: List[str], concurrency: int = 3) -> List[EngagementResult]:
+        """Like several Instagram posts using a small pool of pages"""
+        if not self.logged_in or not post_ids:
+            return [await self.like(post_id) for post_id in post_ids]
+        
+        # Each page serves one like at a time
+        pool: asyncio.Queue = asyncio.Queue()
+        pages = []
+        
+        async def like_with_pool(post_id: str) -> EngagementResult:
+            page = await pool.get()
+            try:
+                return await self._like_on_page(page, post_id)
+            finally:
+                pool.put_nowait(page)
+        
+        try:
+            for _ in range(min(concurrency, len(post_ids))):
+                page = await self.context.new_page()
+                pages.append(page)
+                self._open_pool_pages += 1
+                pool.put_nowait(page)
+            
+            return list(await asyncio.gather(
+                *[like_with_pool(post_id) for post_id in post_ids]
+            ))
+        finally:
+            for page in pages:
+                self._open_pool_pages -= 1
+                await page.close()
+    
+    @_throttled("like", _rate_limited_result("like"))
+    async def _like_on_page(self, page, post_id: str) -> EngagementResult:
+        """Like a post using the given page (None for the main page)"""
         try:
-            await self.page.goto(f"https://www.instagram.com/p/{post_id}/")
-            await self.page.wait_for_load_state("networkidle")
+            page = await self._goto(f"https://www.instagram.com/p/{post_id}/", page)
             
             # Find like button and click
-            like_btn = await self.page.query_selector('svg[aria-label="赞"]')
+            like_btn = await self._find_localized(page, "like")
             if like_btn:
                 await like_btn.click()
                 
@@ -248,6 +595,8 @@ class InstagramAdapter(PlatformAdapter):
                 error="Like button not found"
             )
             
+        except TransientError:
+            raise
         except Exception as e:
             return EngagementResult(
                 success=False,
@@ -268,22 +617,133 @@ class InstagramAdapter(PlatformAdapter):
             error="Not implemented"
         )
     
+    def _cache_get(self, cache: "OrderedDict[str, Tuple[Any, float]]", key: str) -> Optional[Any]:
+        """Return a cached value if it hasn't expired"""
+        entry = cache.get(key)
+        if entry is None:
+            return None
+        
+        value, expires = entry
+        if time.monotonic() >= expires:
+            del cache[key]
+            return None
+        
+        cache.move_to_end(key)
+        return value
+    
+    def _cache_put(self, cache: "OrderedDict[str, Tuple[Any, float]]", key: str, value: Any):
+        """Cache a value for the configured TTL, evicting the least recently used"""
+        cache[key] = (value, time.monotonic() + self._cache_ttl)
+        cache.move_to_end(key)
+        if len(cache) > self._cache_size:
+            cache.popitem(last=False)
+    
     async def _init_browser(self):
-        """Initialize browser if not already done"""
+        """Initialize browser context if not already done"""
         if self.browser is None:
-            from playwright.async_api import async_playwright
-            self.browser = await async_playwright()..chromium.launch(headless=False)
-            self.context = await self.browser.new_context()
-            self.page = await self.context.new_page()
+            browser = await _SharedBrowser.acquire(self.config)
+            context = None
+            try:
+                context = await browser.new_context()
+                page = await context.new_page()
+            except Exception:
+                # Don't hold a reference to the shared browser we can't use
+                if context:
+                    await context.close()
+                await _SharedBrowser.release(self.config)
+                raise
+            
+            self.browser, self.context, self.page = browser, context, page
+            self._ops_since_recycle = 0
+    
+    async def _goto(self, url: str, page=None):
+        """
+        Navigate a page (the main page by default) and return it
+        The context is recycled every N navigations, replacing the main page
+        """
+        if page is None:
+            # Pooled pages belong to the current context, so only recycle
+            # from the main page while none are open
+            if (
+                self._ops_since_recycle >= self._max_ops_per_context
+                and not self._open_pool_pages
+            ):
+                await self._recycle_context()
+            page = self.page
+        
+        self._ops_since_recycle += 1
+        # Instagram keeps connections open, so networkidle rarely fires;
+        # callers wait for the specific element they need instead
+        response = await page.goto(url, wait_until="domcontentloaded")
+        
+        if (
+            (response is not None and response.status in SOFT_BLOCK_STATUSES)
+            or any(path in page.url for path in SOFT_BLOCK_PATHS)
+        ):
+            raise TransientError(f"soft-blocked loading {url}")
+        
+        return page
+    
+    async def _wait_for(self, selector: str, page=None):
+        """Wait briefly for an element, returning None if it doesn't appear"""
+        from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+        
+        page = page or self.page
+        try:
+            return await page.wait_for_selector(
+                selector,
+                timeout=SELECTOR_TIMEOUT_MS
+            )
+        except PlaywrightTimeoutError:
+            return None
+    
+    async def _find_localized(self, page, kind: str):
+        """
+        Locate an element whose selector depends on the UI language
+        The matching selector is remembered so later calls skip the probe
+        """
+        combined, selectors = LOCALIZED_SELECTORS[kind]
+        selector = self._selectors.get(kind, combined)
+        
+        if await self._wait_for(selector, page) is None:
+            # Locale may have changed, probe again next time
+            self._selectors.pop(kind, None)
+            return None
+        
+        if kind not in self._selectors:
+            for candidate in selectors:
+                if await page.locator(candidate).first.is_visible():
+                    self._selectors[kind] = selector = candidate
+                    break
+        
+        return page.locator(selector).first
+    
+    async def _recycle_context(self):
+        """Replace the browser context, keeping the current login state"""
+        # Carry over cookies Instagram rotated since login
+        self._saved_state = await self.context.storage_state()
+        await self.context.close()
+        self.context = await self.browser.new_context(storage_state=self._saved_state)
+        self.page = await self.context.new_page()
+        self._ops_since_recycle = 0
     
     async def close(self):
-        """Cleanup browser"""
+        """Cleanup browser context, HTTP session and the shared browser"""
+        if self._http:
+            await self._http.close()
+            self._http = None
+        
         if self.browser:
-            await self.browser.close()
-            self.browser = None
-            self.context = None
-            self.page = None
-            self.logged_in = False
+            try:
+                if self.context:
+                    await self.context.close()
+            finally:
+                await _SharedBrowser.release(self.config)
+                self.browser = None
+                self.context = None
+                self.page = None
+                self.logged_in = False
+                self._saved_state = None
     
     def is_logged_in(self) -> bool:
         return self.logged_in
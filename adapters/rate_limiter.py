@@ -0,0 +1,52 @@
+"""
+Rate Limiter
+Token bucket throttling shared by platform adapters
+"""
+
+import asyncio
+import time
+from typing import Dict, List
+
+
+class TransientError(Exception):
+    """Temporary platform-side failure worth retrying, e.g. soft throttling"""
+    pass
+
+
+class RateLimiter:
+    """Token bucket rate limiter with one bucket per action"""
+    
+    def __init__(self, rates_per_hour: Dict[str, float]):
+        """
+        rates_per_hour maps an action (comment, like, search, ...) to the
+        number of calls allowed per hour. Actions not listed are unlimited.
+        """
+        self.rates_per_hour = dict(rates_per_hour)
+        self._buckets: Dict[str, List[float]] = {}  # action -> [tokens, last refill]
+        self._locks: Dict[str, asyncio.Lock] = {}
+    
+    async def acquire(self, action: str):
+        """Wait until a call for this action is allowed"""
+        per_hour = self.rates_per_hour.get(action)
+        if not per_hour:
+            return
+        
+        rate = per_hour / 3600  # tokens per second
+        capacity = max(1.0, per_hour / 60)  # allow about a minute's worth of burst
+        
+        lock = self._locks.get(action)
+        if lock is None:
+            lock = self._locks[action] = asyncio.Lock()
+        async with lock:
+            bucket = self._buckets.setdefault(action, [capacity, time.monotonic()])
+            
+            while True:
+                now = time.monotonic()
+                bucket[0] = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+                bucket[1] = now
+                
+                if bucket[0] >= 1:
+                    bucket[0] -= 1
+                    return
+                
+                await asyncio.sleep((1 - bucket[0]) / rate)
@@ -5,14 +5,52 @@ Track and analyze engagement results
 
 import sqlite3
 import json
-from typing import List, Dict, Optional
+import threading
+from typing import List, Dict, Optional, Iterator, FrozenSet
 from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
 
-from adapters.base import Platform, EngagementResult
+from adapters.base import Platform, EngagementResult, SLOTS
 
 
-@dataclass
+# Rows fetched per lock acquisition when streaming results
+_FETCH_BATCH_SIZE = 100
+
+_INSERT_ENGAGEMENT = """
+    INSERT INTO engagements (platform, action, post_id, post_author, comment, success, error)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Fixed statement text per action so SQLite reuses the compiled statement
+_DAILY_STATS_UPSERT = {
+    "comment": """
+        INSERT INTO daily_stats (date, comments_posted, success_count, failure_count)
+        VALUES (?, 1, ?, ?)
+        ON CONFLICT(date) DO UPDATE SET
+            comments_posted = comments_posted + 1,
+            success_count = success_count + ?,
+            failure_count = failure_count + ?
+    """,
+    "like": """
+        INSERT INTO daily_stats (date, likes_posted, success_count, failure_count)
+        VALUES (?, 1, ?, ?)
+        ON CONFLICT(date) DO UPDATE SET
+            likes_posted = likes_posted + 1,
+            success_count = success_count + ?,
+            failure_count = failure_count + ?
+    """,
+    "follow": """
+        INSERT INTO daily_stats (date, follows_posted, success_count, failure_count)
+        VALUES (?, 1, ?, ?)
+        ON CONFLICT(date) DO UPDATE SET
+            follows_posted = follows_posted + 1,
+            success_count = success_count + ?,
+            failure_count = failure_count + ?
+    """,
+}
+
+
+@dataclass(**SLOTS)
 class EngagementRecord:
     """Record of an engagement action"""
     id: int = 0
@@ -35,94 +73,113 @@ class Analytics:
     
     def __init__(self, db_path: str = "engagement.db"):
         self.db_path = db_path
+        
+        # One long-lived connection instead of reconnecting per query
+        self._conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._lock = threading.Lock()
+        
+        # Reused by every locked query; streaming reads open their own
+        self._cursor = self._conn.cursor()
+        
+        # Post IDs already commented on, loaded on first lookup
+        self._engaged_cache: Optional[set] = None
+        
         self._init_db()
     
     def _init_db(self):
         """Initialize database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS engagements (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                platform TEXT NOT NULL,
-                action TEXT NOT NULL,
-                post_id TEXT NOT NULL,
-                post_author TEXT,
-                comment TEXT,
-                success INTEGER NOT NULL,
-                error TEXT,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS daily_stats (
-                date TEXT PRIMARY KEY,
-                comments_posted INTEGER DEFAULT 0,
-                likes_posted INTEGER DEFAULT 0,
-                follows_posted INTEGER DEFAULT 0,
-                success_count INTEGER DEFAULT 0,
-                failure_count INTEGER DEFAULT 0
-            )
-        """)
-        
-        conn.commit()
-        conn.close()
+        with self._lock:
+            cursor = self._cursor
+            
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS engagements (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    platform TEXT NOT NULL,
+                    action TEXT NOT NULL,
+                    post_id TEXT NOT NULL,
+                    post_author TEXT,
+                    comment TEXT,
+                    success INTEGER NOT NULL,
+                    error TEXT,
+                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_engagements_post_action
+                ON engagements(post_id, action)
+            """)
+            
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_engagements_ts
+                ON engagements(timestamp)
+            """)
+            
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS daily_stats (
+                    date TEXT PRIMARY KEY,
+                    comments_posted INTEGER DEFAULT 0,
+                    likes_posted INTEGER DEFAULT 0,
+                    follows_posted INTEGER DEFAULT 0,
+                    success_count INTEGER DEFAULT 0,
+                    failure_count INTEGER DEFAULT 0
+                )
+            """)
     
     def record(self, result: EngagementResult, post_author: str = "", comment: str = ""):
         """Record an engagement result"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Insert engagement record
-        cursor.execute("""
-            INSERT INTO engagements (platform, action, post_id, post_author, comment, success, error)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (
-            result.platform.value,
-            result.action,
-            result.post_id,
-            post_author,
-            comment,
-            1 if result.success else 0,
-            result.error or ""
-        ))
+        success = 1 if result.success else 0
         
-        # Update daily stats
-        date = datetime.now().strftime("%Y-%m-%d")
-        
-        action_col = f"{result.action}s_posted"
-        if action_col in ["comments_posted", "likes_posted", "follows_posted"]:
-            cursor.execute(f"""
-                INSERT INTO daily_stats (date, {action_col}, success_count, failure_count)
-                VALUES (?, 1, ?, ?)
-                ON CONFLICT(date) DO UPDATE SET
-                    {action_col} = {action_col} + 1,
-                    success_count = success_count + ?,
-                    failure_count = failure_count + ?
-            """, (date, 
-                  1 if result.success else 0, 
-                  0 if result.success else 1,
-                  1 if result.success else 0,
-                  0 if result.success else 1))
-        
-        conn.commit()
-        conn.close()
+        # Both writes share one transaction, i.e. a single sync to disk
+        with self._lock, self._conn:
+            cursor = self._cursor
+            cursor.execute("BEGIN IMMEDIATE")
+            
+            # Insert engagement record
+            cursor.execute(_INSERT_ENGAGEMENT, (
+                result.platform.value,
+                result.action,
+                result.post_id,
+                post_author,
+                comment,
+                success,
+                result.error or ""
+            ))
+            
+            # Update daily stats
+            upsert = _DAILY_STATS_UPSERT.get(result.action)
+            if upsert:
+                date = datetime.now().strftime("%Y-%m-%d")
+                cursor.execute(upsert, (
+                    date,
+                    success,
+                    1 - success,
+                    success,
+                    1 - success
+                ))
+            
+            if result.action == "comment" and self._engaged_cache is not None:
+                self._engaged_cache.add(result.post_id)
     
     def get_daily_stats(self, days: int = 7) -> List[Dict]:
         """Get stats for last N days"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT * FROM daily_stats
-            ORDER BY date DESC
-            LIMIT ?
-        """, (days,))
-        
-        rows = cursor.fetchall()
-        conn.close()
+        with self._lock:
+            cursor = self._cursor
+            
+            cursor.execute("""
+                SELECT * FROM daily_stats
+                ORDER BY date DESC
+                LIMIT ?
+            """, (days,))
+            
+            rows = cursor.fetchall()
         
         return [
             {
@@ -138,32 +195,30 @@ class Analytics:
     
     def get_total_stats(self) -> Dict:
         """Get overall stats"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Total engagements
-        cursor.execute("""
-            SELECT action, COUNT(*) as count, SUM(success) as success
-            FROM engagements
-            GROUP BY action
-        """)
-        action_stats = cursor.fetchall()
-        
-        # Today's engagements
-        cursor.execute("""
-            SELECT COUNT(*) FROM engagements
-            WHERE date(timestamp) = date('now')
-        """)
-        today_count = cursor.fetchone()[0]
-        
-        # This week
-        cursor.execute("""
-            SELECT COUNT(*) FROM engagements
-            WHERE timestamp > datetime('now', '-7 days')
-        """)
-        week_count = cursor.fetchone()[0]
-        
-        conn.close()
+        with self._lock:
+            cursor = self._cursor
+            
+            # Total engagements
+            cursor.execute("""
+                SELECT action, COUNT(*) as count, SUM(success) as success
+                FROM engagements
+                GROUP BY action
+            """)
+            action_stats = cursor.fetchall()
+            
+            # Today's engagements
+            cursor.execute("""
+                SELECT COUNT(*) FROM engagements
+                WHERE date(timestamp) = date('now')
+            """)
+            today_count = cursor.fetchone()[0]
+            
+            # This week
+            cursor.execute("""
+                SELECT COUNT(*) FROM engagements
+                WHERE timestamp > datetime('now', '-7 days')
+            """)
+            week_count = cursor.fetchone()[0]
         
         return {
             "today": today_count,
@@ -176,62 +231,79 @@ class Analytics:
     
     def get_recent_engagements(self, limit: int = 20) -> List[EngagementRecord]:
         """Get recent engagement records"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT * FROM engagements
-            ORDER BY timestamp DESC
-            LIMIT ?
-        """, (limit,))
-        
-        rows = cursor.fetchall()
-        conn.close()
+        return list(self.iter_recent_engagements(limit))
+    
+    def iter_recent_engagements(self, limit: int = 20) -> Iterator[EngagementRecord]:
+        """Stream recent engagement records without loading them all at once"""
+        with self._lock:
+            cursor = self._conn.cursor()
+            
+            cursor.execute("""
+                SELECT * FROM engagements
+                ORDER BY timestamp DESC
+                LIMIT ?
+            """, (limit,))
         
-        return [
-            EngagementRecord(
-                id=row[0],
-                platform=row[1],
-                action=row[2],
-                post_id=row[3],
-                post_author=row[4],
-                comment=row[5],
-                success=bool(row[6]),
-                error=row[7],
-                timestamp=datetime.fromisoformat(row[8])
-            )
-            for row in rows
-        ]
+        while True:
+            # Don't hold the lock while the caller consumes records
+            with self._lock:
+                rows = cursor.fetchmany(_FETCH_BATCH_SIZE)
+            if not rows:
+                break
+            
+            for row in rows:
+                yield EngagementRecord(
+                    id=row[0],
+                    platform=row[1],
+                    action=row[2],
+                    post_id=row[3],
+                    post_author=row[4],
+                    comment=row[5],
+                    success=bool(row[6]),
+                    error=row[7],
+                    timestamp=datetime.fromisoformat(row[8])
+                )
     
     def is_engaged(self, post_id: str) -> bool:
         """Check if already engaged with a post"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT COUNT(*) FROM engagements
-            WHERE post_id = ? AND action = 'comment'
-        """, (post_id,))
-        
-        count = cursor.fetchone()[0]
-        conn.close()
+        with self._lock:
+            return post_id in self._engaged_ids()
+    
+    def engaged_id_set(self) -> FrozenSet[str]:
+        """Snapshot of every post ID already commented on"""
+        with self._lock:
+            return frozenset(self._engaged_ids())
+    
+    def _engaged_ids(self) -> set:
+        """Commented post IDs, loaded on first use (caller holds the lock)"""
+        if self._engaged_cache is None:
+            cursor = self._cursor
+            cursor.execute("""
+                SELECT post_id FROM engagements
+                WHERE action = 'comment'
+            """)
+            self._engaged_cache = {row[0] for row in cursor}
         
-        return count > 0
+        return self._engaged_cache
     
     def get_engagement_rate(self, days: int = 30) -> float:
         """Calculate engagement success rate"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT SUM(success), COUNT(*) FROM engagements
-            WHERE timestamp > datetime('now', '-{} days')
-        """.format(days))
-        
-        result = cursor.fetchone()
-        conn.close()
+        with self._lock:
+            cursor = self._cursor
+            
+            cursor.execute("""
+                SELECT SUM(success), COUNT(*) FROM engagements
+                WHERE timestamp > datetime('now', '-{} days')
+            """.format(days))
+            
+            result = cursor.fetchone()
         
         if result[1] == 0:
             return 0.0
         
         return (result[0] / result[1]) * 100
+    
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
@@ -3,14 +3,20 @@ Discovery Module
 Platform-agnostic post/user discovery
 """
 
-from typing import List, Dict, Optional
+import asyncio
+import heapq
+import logging
+import sys
+from typing import List, Dict, Optional, Set
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 
-from adapters.base import Platform, Post
+from adapters.base import Platform, Post, SLOTS
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+
+@dataclass(**SLOTS)
 class DiscoveryConfig:
     """Configuration for discovery"""
     platforms: List[Platform] = field(default_factory=lambda: [Platform.INSTAGRAM])
@@ -25,7 +31,7 @@ class DiscoveryConfig:
     exclude_hashtags: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(**SLOTS)
 class DiscoveredPost:
     """A discovered post ready for engagement"""
     post: Post
@@ -34,6 +40,26 @@ class DiscoveredPost:
     filters_passed: List[str] = field(default_factory=list)
 
 
+@dataclass
+class _Criteria:
+    """Lookup sets derived from a DiscoveryConfig once per discover() call"""
+    hashtags: Set[str]  # lowercased
+    keywords: List[str]  # lowercased
+    exclude_users: Set[str]
+    exclude_hashtags: Set[str]
+    now: float  # POSIX timestamp shared by the whole batch
+    
+    @classmethod
+    def from_config(cls, config: DiscoveryConfig) -> "_Criteria":
+        return cls(
+            hashtags={sys.intern(h.lower()) for h in config.hashtags},
+            keywords=[k.lower() for k in config.keywords],
+            exclude_users=set(config.exclude_users),
+            exclude_hashtags={sys.intern(h) for h in config.exclude_hashtags},
+            now=datetime.now().timestamp()
+        )
+
+
 class Discovery:
     """Cross-platform discovery engine"""
     
@@ -47,51 +73,69 @@ class Discovery:
         """Discover posts across platforms"""
         results = []
         
+        # Build search query
+        query = " ".join(config.keywords) if config.keywords else None
+        
+        resolved = []
         for platform in config.platforms:
             adapter = self.adapters.get(platform)
             if not adapter:
-                print(f"No adapter for {platform}")
+                logger.warning("No adapter for %s", platform)
+                continue
+            resolved.append((platform, adapter))
+        
+        # Search all platforms concurrently
+        tasks = [
+            adapter.search_posts(
+                query=query,
+                hashtags=config.hashtags,
+                location=config.location,
+                limit=config.limit
+            )
+            for platform, adapter in resolved
+        ]
+        gathered = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        criteria = _Criteria.from_config(config)
+        intern = sys.intern
+        
+        for (platform, _), posts in zip(resolved, gathered):
+            if isinstance(posts, BaseException):
+                logger.warning("Discovery failed for %s: %s", platform, posts)
                 continue
             
-            # Build search query
-            query = " ".join(config.keywords) if config.keywords else None
-            
-            try:
-                posts = await adapter.search_posts(
-                    query=query,
-                    hashtags=config.hashtags,
-                    location=config.location,
-                    limit=config.limit
-                )
+            for post in posts:
+                # Tags repeat across a batch; share one string per distinct tag
+                if post.hashtags:
+                    post.hashtags = [intern(h) for h in post.hashtags]
                 
-                for post in posts:
-                    discovered = self._evaluate_post(post, config)
-                    if discovered:
-                        results.append(discovered)
-            
-            except Exception as e:
-                print(f"Discovery failed for {platform}: {e}")
-        
-        # Sort by engagement score
-        results.sort(key=lambda x: x.engagement_score, reverse=True)
-        
-        return results[:config.limit]
+                discovered = self._evaluate_post(post, config, criteria)
+                if discovered:
+                    results.append(discovered)
+        
+        # Top posts by engagement score
+        return heapq.nlargest(
+            config.limit,
+            results,
+            key=lambda x: x.engagement_score
+        )
     
     def _evaluate_post(
         self,
         post: Post,
-        config: DiscoveryConfig
+        config: DiscoveryConfig,
+        criteria: _Criteria
     ) -> Optional[DiscoveredPost]:
         """Evaluate if a post should be engaged with"""
         filters_passed = []
         
         # Check user exclusions
-        if post.author in config.exclude_users:
+        if post.author in criteria.exclude_users:
             return None
         
         # Check hashtag exclusions
         for hashtag in post.hashtags:
-            if hashtag in config.exclude_hashtags:
+            if hashtag in criteria.exclude_hashtags:
                 return None
         
         # Check likes range
@@ -99,16 +143,16 @@ class Discovery:
             return None
         
         # Calculate engagement score
-        score = self._calculate_score(post, config)
+        score = self._calculate_score(post, criteria)
         
         return DiscoveredPost(
             post=post,
             engagement_score=score,
-            reason=self._get_reason(post, config),
+            reason=self._get_reason(post, criteria),
             filters_passed=filters_passed
         )
     
-    def _calculate_score(self, post: Post, config: DiscoveryConfig) -> float:
+    def _calculate_score(self, post: Post, criteria: _Criteria) -> float:
         """Calculate engagement score for a post"""
         score = 0.0
         
@@ -118,7 +162,7 @@ class Discovery:
         
         # Recency bonus
         if post.timestamp:
-            hours_old = (datetime.now() - post.timestamp).total_seconds() / 3600
+            hours_old = (criteria.now - post.timestamp.timestamp()) / 3600
             if hours_old < 1:
                 score += 5
             elif hours_old < 6:
@@ -128,23 +172,23 @@ class Discovery:
         
         # Hashtag relevance
         for hashtag in post.hashtags:
-            if hashtag.lower() in [h.lower() for h in config.hashtags]:
+            if hashtag.lower() in criteria.hashtags:
                 score += 2
         
         # Keyword relevance
-        for keyword in config.keywords:
-            if keyword.lower() in post.content.lower():
+        content = post.content.lower()
+        for keyword in criteria.keywords:
+            if keyword in content:
                 score += 3
         
         return score
     
-    def _get_reason(self, post: Post, config: DiscoveryConfig) -> str:
+    def _get_reason(self, post: Post, criteria: _Criteria) -> str:
         """Get human-readable reason for discovery"""
         reasons = []
         
         if post.hashtags:
-            matching = [h for h in post.hashtags 
-                       if h.lower() in [t.lower() for t in config.hashtags]]
+            matching = [h for h in post.hashtags if h.lower() in criteria.hashtags]
             if matching:
                 reasons.append(f"Matching hashtags: {', '.join(matching)}")
         
@@ -152,7 +196,7 @@ class Discovery:
             reasons.append(f"Good engagement: {post.likes} likes")
         
         if post.timestamp:
-            hours_old = (datetime.now() - post.timestamp).total_seconds() / 3600
+            hours_old = (criteria.now - post.timestamp.timestamp()) / 3600
             if hours_old < 6:
                 reasons.append("Recent post")
         
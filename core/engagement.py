@@ -3,14 +3,98 @@ Engagement Module
 Comment generation using LLM
 """
 
+import asyncio
+import functools
+import hashlib
 import json
+import logging
 import random
-from typing import List, Dict, Optional
+import re
+import time
+from collections import OrderedDict
+from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 
 from adapters.base import Post, EngagementResult, Platform
 
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+# Generated comment lists kept per (content, tone, interests)
+RESPONSE_CACHE_SIZE = 1024
+RESPONSE_CACHE_TTL_SECONDS = 24 * 3600
+
+# LLM responses are parsed with orjson when it's installed
+_json_loads = orjson.loads if orjson else json.loads
+
+# Distinct captions remembered for skipping the LLM on exact repeats
+SEEN_CONTENT_SIZE = 4096
+
+# Outermost [...] span in an LLM response
+_JSON_ARRAY_RE = re.compile(r'\[.*\]', re.DOTALL)
+
+# Fixed instructions leading every comment prompt
+SYSTEM_PREFIX = """You are a social media engagement specialist. Generate 3-5 genuine, contextual comments for the Instagram post described at the end.
+
+Requirements:
+- Length: 1-3 sentences max
+- Genuine and conversational
+- NO generic spam like "great post!", "🔥🔥🔥", "nicee"
+- Ask questions to start conversation
+- Show you actually read/understood the post
+
+Return ONLY a JSON array of strings, nothing else. Example:
+["Comment 1", "Comment 2", "Comment 3"]
+"""
+
+POST_HEADER = """
+Post Details:
+"""
+
+
+COMMENT_TEMPLATES = (
+    "This is exactly what I've been looking for! 👏",
+    "Love this! What made you get into {interest}?",
+    "This is inspiring! Any tips for beginners?",
+    "Where is this? Looks amazing! 🧗",
+    "This is goals! 🔥 How long have you been doing this?",
+    "Just started getting into {interest} - this gives me motivation!",
+    "The community around here is so supportive 💪",
+    "Absolutely incredible shot! What camera/filter did you use?",
+)
+
+# The five fallback options offered, flagged if they need {interest} filled in
+_TEMPLATE_OPTIONS = tuple(
+    (template, "{interest}" in template)
+    for template in COMMENT_TEMPLATES[:5]
+)
+
+
+@functools.lru_cache(maxsize=32)
+def _campaign_block(
+    interests: tuple,
+    demographics: str,
+    pain_points: tuple,
+    desires: tuple,
+    tone: str
+) -> str:
+    """Audience and tone section, identical for every post in a campaign"""
+    return f"""
+Target Audience:
+- Interests: {', '.join(interests)}
+- Demographics: {demographics}
+- Pain points: {', '.join(pain_points)}
+- Desires: {', '.join(desires)}
+
+Tone: {tone}
+"""
+
 
 @dataclass
 class TargetAudience:
@@ -30,18 +114,42 @@ class EngagementConfig:
     min_delay_seconds: int = 30
     max_delay_seconds: int = 120
     skip_already_engaged: bool = True
+    llm_concurrency: int = 5  # Max LLM requests in flight at once
+    min_llm_content_length: int = 40  # Shorter non-empty captions get template comments; 0 disables
+    
+    def __post_init__(self):
+        if self.llm_concurrency < 1:
+            raise ValueError(f"llm_concurrency must be at least 1, got {self.llm_concurrency}")
 
 
 class Engagement:
     """Handles comment generation and posting"""
     
-    def __init__(self, llm_wrapper=None):
+    def __init__(self, llm_wrapper=None, llm_retries: int = 3, llm_backoff_seconds: float = 1.0):
+        if llm_retries < 1:
+            raise ValueError(f"llm_retries must be at least 1, got {llm_retries}")
+        
         self.llm = llm_wrapper
+        self.llm_retries = llm_retries
+        self.llm_backoff_seconds = llm_backoff_seconds
+        
+        # One semaphore per EngagementConfig.llm_concurrency value in use
+        self._llm_semaphores: Dict[int, asyncio.Semaphore] = {}
+        
+        # Identical prompts share one LLM call, keyed by SHA-256 of the prompt
+        self._inflight: Dict[str, asyncio.Future] = {}
+        
+        # LRU of LLM comments for repeated content: key -> (comments, expiry)
+        self._response_cache: "OrderedDict[bytes, Tuple[List[str], float]]" = OrderedDict()
+        
+        # LRU of captions the LLM has already written comments for
+        self._seen_content: "OrderedDict[str, None]" = OrderedDict()
     
     async def generate_comment(
         self,
         post: Post,
-        config: EngagementConfig
+        config: EngagementConfig,
+        campaign_block: Optional[str] = None
     ) -> List[str]:
         """Generate multiple comment options for a post"""
         
@@ -49,67 +157,195 @@ class Engagement:
             # Fallback to template comments
             return self._generate_template_comments(post, config)
         
-        # Build prompt for LLM
-        prompt = self._build_comment_prompt(post, config)
+        # Caching by caption only makes sense when the adapter filled one in
+        content = post.content.strip()
+        key = self._response_key(post, config) if content else None
+        if key is not None:
+            cached = self._response_cache_get(key)
+            if cached:
+                return cached
+        
+        # Low-value posts (short captions, reposted text) aren't worth a call.
+        # Posts whose caption the adapter didn't extract still go to the LLM.
+        if content and (
+            len(content) < config.min_llm_content_length
+            or content in self._seen_content
+        ):
+            return self._generate_template_comments(post, config)
         
         try:
+            # Build prompt for LLM
+            prompt = self._build_comment_prompt(post, config, campaign_block)
+            
             # Use LLM to generate comments
-            response = self.llm.complete(prompt, temperature=0.8)
+            comments = await self._complete_deduplicated(prompt, config)
+        
+        except Exception as e:
+            logger.warning("LLM comment generation failed: %s", e)
+            return self._generate_template_comments(post, config)
+        
+        # Template fallbacks aren't cached so later posts can still reach the LLM
+        if comments and key is not None:
+            self._response_cache_put(key, comments)
+            self._mark_seen(content)
+        return comments
+    
+    def _mark_seen(self, content: str):
+        """Remember a caption the LLM has written comments for"""
+        self._seen_content[content] = None
+        self._seen_content.move_to_end(content)
+        if len(self._seen_content) > SEEN_CONTENT_SIZE:
+            self._seen_content.popitem(last=False)
+    
+    def _response_key(self, post: Post, config: EngagementConfig) -> bytes:
+        """Cache key for posts that should get the same comment options"""
+        raw = f"{post.content}|{config.tone}|{','.join(config.audience.interests)}"
+        return hashlib.blake2b(raw.encode(), digest_size=16).digest()
+    
+    def _response_cache_get(self, key: bytes) -> Optional[List[str]]:
+        """
+        Return a shuffled copy of cached comments, or None
+        Comments are sampled at temperature 0.8, so a hit reuses one sample
+        for every post with the same content. Shuffling keeps engage() from
+        posting the identical first option each time.
+        """
+        entry = self._response_cache.get(key)
+        if entry is None:
+            return None
+        
+        comments, expires = entry
+        if time.monotonic() >= expires:
+            del self._response_cache[key]
+            return None
+        
+        self._response_cache.move_to_end(key)
+        comments = list(comments)
+        random.shuffle(comments)
+        return comments
+    
+    def _response_cache_put(self, key: bytes, comments: List[str]):
+        """Cache comments for RESPONSE_CACHE_TTL_SECONDS, evicting the oldest"""
+        self._response_cache[key] = (list(comments), time.monotonic() + RESPONSE_CACHE_TTL_SECONDS)
+        self._response_cache.move_to_end(key)
+        if len(self._response_cache) > RESPONSE_CACHE_SIZE:
+            self._response_cache.popitem(last=False)
+    
+    async def _complete_deduplicated(self, prompt: str, config: EngagementConfig) -> List[str]:
+        """
+        Get parsed comments for a prompt
+        Prompts already in flight await the same future instead of calling
+        the LLM again. The dict needs no lock: nothing is awaited between
+        looking a key up and registering it.
+        """
+        key = hashlib.sha256(prompt.encode()).hexdigest()
+        
+        inflight = self._inflight.get(key)
+        while inflight is not None:
+            try:
+                # Shielded so cancelling one waiter doesn't cancel the others
+                comments = list(await asyncio.shield(inflight))
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # The owning call was cancelled; take over or join a newer one
+                inflight = self._inflight.get(key)
+                continue
             
-            # Parse response into list
-            comments = self._parse_comments(response)
+            # Shuffled like a cache hit so duplicates in one batch don't all
+            # post the same first option
+            random.shuffle(comments)
             return comments
         
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            response = await self._llm_complete_async(prompt, config.llm_concurrency)
+            
+            # Parse response into list
+            comments = self._parse_comments(response)
         except Exception as e:
-            print(f"LLM comment generation failed: {e}")
-            return self._generate_template_comments(post, config)
+            future.set_exception(e)
+            future.exception()  # Waiters re-raise it; don't warn if there are none
+            raise
+        else:
+            future.set_result(comments)
+        finally:
+            del self._inflight[key]
+            if not future.done():
+                # Owner was cancelled; wake waiters so they can retry
+                future.cancel()
+        
+        return list(comments)
     
-    def _build_comment_prompt(self, post: Post, config: EngagementConfig) -> str:
-        """Build prompt for comment generation"""
+    async def _llm_complete_async(self, prompt: str, concurrency: int) -> str:
+        """
+        Run the blocking LLM call in a worker thread
+        At most `concurrency` calls run at once for configs sharing that
+        limit; failures are retried with exponential backoff before the last
+        error is raised.
+        """
+        semaphore = self._llm_semaphores.get(concurrency)
+        if semaphore is None:
+            semaphore = self._llm_semaphores[concurrency] = asyncio.Semaphore(concurrency)
         
-        audience_info = f"""
-Target Audience:
-- Interests: {', '.join(config.audience.interests)}
-- Demographics: {json.dumps(config.audience.demographics)}
-- Pain points: {', '.join(config.audience.pain_points)}
-- Desires: {', '.join(config.audience.desires)}
-"""
+        loop = asyncio.get_running_loop()
+        complete = functools.partial(self.llm.complete, prompt, temperature=0.8)
         
-        post_info = f"""
-Post Details:
-- Author: {post.author}
-- Content: {post.content}
-- Hashtags: {', '.join(post.hashtags) if post.hashtags else 'None'}
-- Likes: {post.likes}
-"""
+        backoff = self.llm_backoff_seconds
+        async with semaphore:
+            for attempt in range(self.llm_retries):
+                try:
+                    return await loop.run_in_executor(None, complete)
+                except Exception:
+                    if attempt == self.llm_retries - 1:
+                        raise
+                    await asyncio.sleep(backoff)
+                    backoff *= 2
+    
+    def _campaign_block_for(self, config: EngagementConfig) -> str:
+        """Audience and tone section for a config"""
+        audience = config.audience
+        return _campaign_block(
+            tuple(audience.interests),
+            json.dumps(audience.demographics),  # hashable even with list/dict values
+            tuple(audience.pain_points),
+            tuple(audience.desires),
+            config.tone
+        )
+    
+    def _build_comment_prompt(
+        self,
+        post: Post,
+        config: EngagementConfig,
+        campaign_block: Optional[str] = None
+    ) -> str:
+        """
+        Build prompt for comment generation
+        Invariant text comes first and per-post details last, so providers
+        with prefix-based prompt caching can reuse everything but the post.
+        engage() passes campaign_block in, built once for all its posts.
+        """
+        audience_info = campaign_block or self._campaign_block_for(config)
         
-        prompt = f"""You are a social media engagement specialist. Generate 3-5 genuine, contextual comments for the following Instagram post.
-
-{audience_info}
-
-{post_info}
-
-Requirements:
-- Tone: {config.tone}
-- Length: 1-3 sentences max
-- Genuine and conversational
-- NO generic spam like "great post!", "🔥🔥🔥", "nicee"
-- Ask questions to start conversation
-- Show you actually read/understood the post
-
-Return ONLY a JSON array of strings, nothing else. Example:
-["Comment 1", "Comment 2", "Comment 3"]
-"""
-        return prompt
+        # Assemble in one join rather than through intermediate strings
+        return "".join([
+            SYSTEM_PREFIX,
+            audience_info,
+            POST_HEADER,
+            "- Author: ", post.author,
+            "\n- Content: ", post.content,
+            "\n- Hashtags: ", ", ".join(post.hashtags) if post.hashtags else "None",
+            "\n- Likes: ", str(post.likes),
+            "\n"
+        ])
     
     def _parse_comments(self, response: str) -> List[str]:
         """Parse LLM response into comment list"""
         try:
             # Try to find JSON array
-            import re
-            match = re.search(r'\[.*\]', response, re.DOTALL)
+            match = _JSON_ARRAY_RE.search(response)
             if match:
-                comments = json.loads(match.group())
+                comments = _json_loads(match.group())
                 if isinstance(comments, list):
                     return comments
             
@@ -117,7 +353,8 @@ Return ONLY a JSON array of strings, nothing else. Example:
             lines = [l.strip() for l in response.split('\n') if l.strip()]
             return [l for l in lines if len(l) > 10]
         
-        except:
+        except (ValueError, TypeError):
+            # Invalid JSON (JSONDecodeError is a ValueError) or non-text response
             return []
     
     def _generate_template_comments(
@@ -127,26 +364,14 @@ Return ONLY a JSON array of strings, nothing else. Example:
     ) -> List[str]:
         """Generate template-based comments as fallback"""
         
-        templates = [
-            "This is exactly what I've been looking for! 👏",
-            "Love this! What made you get into {interest}?",
-            "This is inspiring! Any tips for beginners?",
-            "Where is this? Looks amazing! 🧗",
-            "This is goals! 🔥 How long have you been doing this?",
-            "Just started getting into {interest} - this gives me motivation!",
-            "The community around here is so supportive 💪",
-            "Absolutely incredible shot! What camera/filter did you use?",
-        ]
-        
         # Personalize based on hashtags
         interest = post.hashtags[0] if post.hashtags else "this"
+        fields = {"interest": interest}
         
-        comments = []
-        for template in templates:
-            comment = template.format(interest=interest)
-            comments.append(comment)
-        
-        return comments[:5]
+        return [
+            template.format_map(fields) if personalized else template
+            for template, personalized in _TEMPLATE_OPTIONS
+        ]
     
     async def engage(
         self,
@@ -156,44 +381,77 @@ Return ONLY a JSON array of strings, nothing else. Example:
         engagement_callback=None
     ) -> List[EngagementResult]:
         """Execute engagement on a list of posts"""
-        results = []
         
-        for i, post in enumerate(posts):
-            # Check daily limit
-            if i >= config.max_daily:
-                print(f"Reached daily limit: {config.max_daily}")
-                break
-            
-            # Random delay between actions (human-like)
-            delay = random.randint(config.min_delay_seconds, config.max_delay_seconds)
-            print(f"Waiting {delay}s before next engagement...")
-            await asyncio.sleep(delay)
-            
-            # Generate comment
-            comments = await self.generate_comment(post, config)
-            
-            if not comments:
-                print(f"Skipping post {post.post_id} - no comments generated")
-                continue
-            
-            # Use first comment
-            comment = comments[0]
-            
-            # Post comment
-            result = await adapter.comment(post.post_id, comment)
-            results.append(result)
-            
-            if result.success:
-                print(f"✅ Commented on {post.post_id}: {comment[:50]}...")
-            else:
-                print(f"❌ Failed: {result.error}")
-            
-            # Callback for tracking
-            if engagement_callback:
-                engagement_callback(post, result)
+        max_daily = config.max_daily
+        
+        # Check daily limit
+        if len(posts) > max_daily:
+            logger.info("Reached daily limit: %d", max_daily)
+            posts = posts[:max_daily]
+        
+        # At most one result per post; skipped posts are trimmed at the end
+        results: List[Optional[EngagementResult]] = [None] * len(posts)
+        count = 0
+        
+        # Shared by every prompt in this run; if the audience can't be
+        # serialized each post falls back to templates on its own
+        campaign_block = None
+        if self.llm:
+            try:
+                campaign_block = self._campaign_block_for(config)
+            except (TypeError, ValueError):
+                pass
+        
+        # Start generating every comment now; LLM calls run concurrently in
+        # the background while the loop below waits between posts
+        generate = self.generate_comment
+        tasks = [
+            asyncio.create_task(generate(post, config, campaign_block))
+            for post in posts
+        ]
+        
+        # Bind per-iteration lookups to locals once
+        min_delay = config.min_delay_seconds
+        max_delay = config.max_delay_seconds
+        randint = random.randint
+        sleep = asyncio.sleep
+        post_comment = adapter.comment
+        log_info = logger.info
         
+        try:
+            for post, task in zip(posts, tasks):
+                # Random delay between actions (human-like)
+                delay = randint(min_delay, max_delay)
+                log_info("Waiting %ds before next engagement...", delay)
+                await sleep(delay)
+                
+                comments = await task
+                
+                if not comments:
+                    log_info("Skipping post %s - no comments generated", post.post_id)
+                    continue
+                
+                # Use first comment
+                comment = comments[0]
+                
+                # Post comment
+                result = await post_comment(post.post_id, comment)
+                results[count] = result
+                count += 1
+                
+                if result.success:
+                    log_info("✅ Commented on %s: %.50s...", post.post_id, comment)
+                else:
+                    logger.warning("❌ Failed: %s", result.error)
+                
+                # Callback for tracking
+                if engagement_callback:
+                    engagement_callback(post, result)
+        
+        finally:
+            # Don't leave generations running if posting was interrupted
+            for task in tasks:
+                task.cancel()
+        
+        del results[count:]
         return results
-
-
-# Helper function for async import
-import asyncio
@@ -4,15 +4,21 @@ Orchestrates discovery, engagement, and analytics
 """
 
 import asyncio
-from typing import List, Dict, Optional
+import logging
+from typing import Callable, List, Dict, Optional, Tuple
 from datetime import datetime
 
-from adapters.base import Platform, PlatformAdapter
+from adapters.base import Platform, PlatformAdapter, Post
 from adapters.instagram import InstagramAdapter
 from core.discovery import Discovery, DiscoveryConfig, DiscoveredPost
 from core.engagement import Engagement, EngagementConfig, TargetAudience
 from core.analytics import Analytics
 
+logger = logging.getLogger(__name__)
+
+# Compiled discover_and_engage plans kept per config pair
+PLAN_CACHE_SIZE = 32
+
 
 class SocialEngagementEngine:
     """
@@ -25,6 +31,10 @@ class SocialEngagementEngine:
         self.discovery = None
         self.engagement = None
         self.analytics = Analytics()
+        
+        # (id(discovery_config), id(engagement_config)) ->
+        #     (discovery_config, engagement_config, fingerprint, plan)
+        self._plan_cache: Dict[Tuple[int, int], tuple] = {}
     
     async def initialize(self):
         """Initialize adapters and components"""
@@ -41,6 +51,9 @@ class SocialEngagementEngine:
         
         # Initialize engagement (will need LLM)
         self.engagement = Engagement()
+        
+        # Plans capture adapters and components, so drop any built before
+        self._plan_cache.clear()
     
     async def login(self, platform: Platform, credentials: Dict) -> bool:
         """Login to a platform"""
@@ -66,43 +79,128 @@ class SocialEngagementEngine:
         }
         
         # Phase 1: Discovery
-        print("🔍 Discovering posts...")
+        logger.info("🔍 Discovering posts...")
         discovered = await self.discovery.discover(discovery_config)
         results["discovered"] = discovered
         
-        print(f"Found {len(discovered)} posts to potentially engage with")
-        
-        # Phase 2: Filter already engaged
-        if engagement_config.skip_already_engaged:
-            to_engage = [
-                d for d in discovered
-                if not self.analytics.is_engaged(d.post.post_id)
-            ]
-            print(f"After filtering already engaged: {len(to_engage)} posts")
-        else:
-            to_engage = discovered
-        
-        # Phase 3: Engage
-        for platform in discovery_config.platforms:
-            adapter = self.adapters.get(platform)
-            if not adapter:
-                continue
+        logger.info("Found %d posts to potentially engage with", len(discovered))
+        
+        # Phases 2 and 3: filter, bucket and engage
+        plan = self._get_plan(discovery_config, engagement_config)
+        await plan(discovered, results)
+        
+        return results
+    
+    def _get_plan(
+        self,
+        discovery_config: DiscoveryConfig,
+        engagement_config: EngagementConfig
+    ) -> Callable:
+        """Return the compiled plan for this config pair, recompiling if stale"""
+        key = (id(discovery_config), id(engagement_config))
+        fingerprint = self._plan_fingerprint(discovery_config, engagement_config)
+        
+        entry = self._plan_cache.get(key)
+        if entry is not None and entry[2] == fingerprint:
+            return entry[3]
+        
+        plan = self._compile_plan(discovery_config, engagement_config)
+        
+        # The configs are stored with the plan so their ids can't be reused
+        self._plan_cache.pop(key, None)
+        self._plan_cache[key] = (discovery_config, engagement_config, fingerprint, plan)
+        if len(self._plan_cache) > PLAN_CACHE_SIZE:
+            del self._plan_cache[next(iter(self._plan_cache))]
+        
+        return plan
+    
+    def _plan_fingerprint(
+        self,
+        discovery_config: DiscoveryConfig,
+        engagement_config: EngagementConfig
+    ) -> tuple:
+        """
+        Config fields and engine components baked into a compiled plan
+        Components are compared by identity; the cached plan holds them, so
+        their ids can't be reused while it exists.
+        """
+        platforms = tuple(discovery_config.platforms)
+        return (
+            platforms,
+            engagement_config.skip_already_engaged,
+            tuple(id(self.adapters.get(platform)) for platform in platforms),
+            id(self.engagement),
+            id(self.analytics)
+        )
+    
+    def _compile_plan(
+        self,
+        discovery_config: DiscoveryConfig,
+        engagement_config: EngagementConfig
+    ) -> Callable:
+        """
+        Resolve the filter, platform buckets and engage calls once per config
+        pair so repeated runs only do the per-post work
+        """
+        targets = [
+            (platform, self.adapters[platform])
+            for platform in discovery_config.platforms
+            if platform in self.adapters
+        ]
+        skip_engaged = engagement_config.skip_already_engaged
+        engaged_id_set = self.analytics.engaged_id_set
+        engage = self.engagement.engage
+        callback = self._on_engagement
+        
+        async def run(discovered: List[DiscoveredPost], results: Dict):
+            # Filter already engaged
+            if skip_engaged:
+                engaged = engaged_id_set()
+                to_engage = [
+                    d for d in discovered
+                    if d.post.post_id not in engaged
+                ]
+                logger.info("After filtering already engaged: %d posts", len(to_engage))
+            else:
+                to_engage = discovered
             
-            posts_to_engage = [d.post for d in to_engage if d.post.platform == platform]
+            # Group posts by platform in a single pass
+            by_platform: Dict[Platform, List[Post]] = {}
+            bucket = by_platform.setdefault
+            for d in to_engage:
+                post = d.post
+                bucket(post.platform, []).append(post)
             
-            print(f"💬 Engaging on {len(posts_to_engage)} {platform.value} posts...")
+            engaged_results = results["engaged"]
+            failed_results = results["failed"]
             
-            engagement_results = await self.engagement.engage(
-                posts_to_engage,
-                adapter,
-                engagement_config,
-                engagement_callback=self._on_engagement
-            )
+            # Engage all platforms at once; each engage() keeps its own
+            # pacing and daily limit
+            tasks = []
+            for platform, adapter in targets:
+                posts_to_engage = by_platform.get(platform, [])
+                
+                logger.info("💬 Engaging on %d %s posts...", len(posts_to_engage), platform.value)
+                
+                tasks.append(asyncio.create_task(engage(
+                    posts_to_engage,
+                    adapter,
+                    engagement_config,
+                    engagement_callback=callback
+                )))
+            
+            try:
+                per_platform = await asyncio.gather(*tasks)
+            finally:
+                # Like a task group: one platform failing stops the others
+                for task in tasks:
+                    task.cancel()
             
-            results["engaged"].extend([r for r in engagement_results if r.success])
-            results["failed"].extend([r for r in engagement_results if not r.success])
+            for engagement_results in per_platform:
+                engaged_results.extend(r for r in engagement_results if r.success)
+                failed_results.extend(r for r in engagement_results if not r.success)
         
-        return results
+        return run
     
     def _on_engagement(self, post, result):
         """Callback when engagement completes"""
@@ -116,6 +214,8 @@ class SocialEngagementEngine:
         """Cleanup resources"""
         for adapter in self.adapters.values():
             await adapter.close()
+        
+        self.analytics.close()
     
     def get_stats(self) -> Dict:
         """Get engagement statistics"""
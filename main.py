@@ -5,8 +5,16 @@ Social Engagement Tool CLI
 
 import asyncio
 import argparse
+import copy
+import functools
+import logging
+import os
+import queue
+import sys
 import yaml
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
+from typing import List, Optional
 
 from core.engine import create_engine, SocialEngagementEngine
 from core.discovery import DiscoveryConfig
@@ -14,10 +22,58 @@ from core.engagement import EngagementConfig, TargetAudience
 from adapters.base import Platform
 
 
+# libyaml-backed loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
 def load_config(config_path: str) -> dict:
     """Load configuration from YAML file"""
+    mtime = os.stat(config_path).st_mtime_ns
+    
+    # Callers get their own copy of the cached parse
+    return copy.deepcopy(_load_config_cached(config_path, mtime))
+
+
+@functools.lru_cache(maxsize=8)
+def _load_config_cached(config_path: str, mtime: int) -> dict:
+    """Parse a config file once per modification time"""
     with open(config_path, 'r') as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=_YAML_LOADER)
+
+
+def setup_logging(config: dict) -> QueueListener:
+    """
+    Send log records through a queue so formatting and writing happen on
+    the listener's thread instead of blocking the event loop
+    """
+    log_config = config.get("logging") or {}
+    
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(logging.Formatter("%(message)s"))
+    handlers = [console]
+    
+    if log_config.get("file"):
+        file_handler = logging.FileHandler(log_config["file"])
+        file_handler.setFormatter(
+            logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+        )
+        handlers.append(file_handler)
+    
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.setLevel(str(log_config.get("level", "INFO")).upper())
+    root.addHandler(QueueHandler(log_queue))
+    
+    listener = QueueListener(log_queue, *handlers)
+    listener.start()
+    return listener
+
+
+def _csv(arg: Optional[str]) -> List[str]:
+    """Split a comma-separated argument into normalized, non-empty tokens"""
+    if not arg:
+        return []
+    return [token for token in (t.strip().lower() for t in arg.split(',')) if token]
 
 
 async def cmd_discover(args, engine: SocialEngagementEngine):
@@ -26,8 +82,8 @@ async def cmd_discover(args, engine: SocialEngagementEngine):
     
     config = DiscoveryConfig(
         platforms=[Platform.INSTAGRAM],
-        hashtags=args.hashtags.split(',') if args.hashtags else [],
-        keywords=args.keywords.split(',') if args.keywords else [],
+        hashtags=_csv(args.hashtags),
+        keywords=_csv(args.keywords),
         location=args.location,
         limit=args.limit
     )
@@ -44,9 +100,11 @@ async def cmd_discover(args, engine: SocialEngagementEngine):
 async def cmd_engage(args, engine: SocialEngagementEngine):
     """Run engagement campaign"""
     
+    hashtags = _csv(args.hashtags)
+    
     # Load audience from config
     audience = TargetAudience(
-        interests=args.interests.split(',') if args.interests else ["rock climbing"],
+        interests=_csv(args.interests) or ["rock climbing"],
         demographics={"location": args.location or "Unknown"},
         pain_points=[],
         desires=[]
@@ -54,8 +112,8 @@ async def cmd_engage(args, engine: SocialEngagementEngine):
     
     discovery_config = DiscoveryConfig(
         platforms=[Platform.INSTAGRAM],
-        hashtags=args.hashtags.split(',') if args.hashtags else [],
-        keywords=args.keywords.split(',') if args.keywords else [],
+        hashtags=hashtags,
+        keywords=_csv(args.keywords),
         location=args.location,
         limit=args.limit
     )
@@ -69,7 +127,7 @@ async def cmd_engage(args, engine: SocialEngagementEngine):
     )
     
     print(f"🚀 Starting engagement campaign...")
-    print(f"   Hashtags: {args.hashtags}")
+    print(f"   Hashtags: {', '.join(hashtags)}")
     print(f"   Location: {args.location}")
     print(f"   Daily limit: {args.daily_limit}")
     
@@ -161,8 +219,13 @@ def main():
         config = {"platforms": {}}
         print(f"⚠️  Config not found at {args.config}, using defaults")
     
+    listener = setup_logging(config)
+    
     # Run command
-    asyncio.run(run_command(args, config))
+    try:
+        asyncio.run(run_command(args, config))
+    finally:
+        listener.stop()
 
 
 async def run_command(args, config):